@@ -19,64 +19,75 @@ current_dir = Path(__file__).parent
 app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
           "static")), name="static")
 
-# In-memory activity database
-activities = {
+# Error details returned by the API
+ERR_NOT_FOUND = "Activity not found"
+ERR_ALREADY_SIGNED_UP = "Student already signed up for this activity"
+ERR_NOT_REGISTERED = "Student is not registered for this activity"
+
+# Seed data for the in-memory activity database (participants are immutable)
+DEFAULT_ACTIVITIES = {
     "Chess Club": {
         "description": "Learn strategies and compete in chess tournaments",
         "schedule": "Fridays, 3:30 PM - 5:00 PM",
         "max_participants": 12,
-        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+        "participants": ("michael@mergington.edu", "daniel@mergington.edu")
     },
     "Programming Class": {
         "description": "Learn programming fundamentals and build software projects",
         "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
         "max_participants": 20,
-        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+        "participants": ("emma@mergington.edu", "sophia@mergington.edu")
     },
     "Gym Class": {
         "description": "Physical education and sports activities",
         "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
         "max_participants": 30,
-        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+        "participants": ("john@mergington.edu", "olivia@mergington.edu")
     },
     "Basketball Team": {
         "description": "Practice basketball skills and compete in inter-school games",
         "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
         "max_participants": 15,
-        "participants": ["james@mergington.edu"]
+        "participants": ("james@mergington.edu",)
     },
     "Swimming Club": {
         "description": "Improve swimming techniques and participate in competitions",
         "schedule": "Mondays and Wednesdays, 3:30 PM - 5:00 PM",
         "max_participants": 25,
-        "participants": ["sarah@mergington.edu", "alex@mergington.edu"]
+        "participants": ("sarah@mergington.edu", "alex@mergington.edu")
     },
     "Art Studio": {
         "description": "Explore various art mediums including painting, drawing, and sculpture",
         "schedule": "Wednesdays, 3:30 PM - 5:30 PM",
         "max_participants": 18,
-        "participants": ["lily@mergington.edu"]
+        "participants": ("lily@mergington.edu",)
     },
     "Drama Club": {
         "description": "Develop acting skills and perform in school theatrical productions",
         "schedule": "Thursdays, 3:30 PM - 5:00 PM",
         "max_participants": 20,
-        "participants": ["grace@mergington.edu", "noah@mergington.edu"]
+        "participants": ("grace@mergington.edu", "noah@mergington.edu")
     },
     "Debate Society": {
         "description": "Enhance critical thinking and public speaking through competitive debates",
         "schedule": "Fridays, 4:00 PM - 5:30 PM",
         "max_participants": 16,
-        "participants": ["william@mergington.edu"]
+        "participants": ("william@mergington.edu",)
     },
     "Science Olympiad": {
         "description": "Prepare for science competitions and conduct experiments",
         "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
         "max_participants": 14,
-        "participants": ["ava@mergington.edu", "ethan@mergington.edu"]
+        "participants": ("ava@mergington.edu", "ethan@mergington.edu")
     }
 }
 
+# In-memory activity database
+activities = {
+    name: {**details, "participants": list(details["participants"])}
+    for name, details in DEFAULT_ACTIVITIES.items()
+}
+
 
 @app.get("/")
 def root():
@@ -93,14 +104,14 @@ def signup_for_activity(activity_name: str, email: str):
     """Sign up a student for an activity"""
     # Validate activity exists
     if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+        raise HTTPException(status_code=404, detail=ERR_NOT_FOUND)
 
     # Get the specific activity
     activity = activities[activity_name]
 
     # Check if already signed up
     if email in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student already signed up for this activity")
+        raise HTTPException(status_code=400, detail=ERR_ALREADY_SIGNED_UP)
     
     # Add student
     activity["participants"].append(email)
@@ -112,14 +123,14 @@ def unregister_from_activity(activity_name: str, email: str):
     """Unregister a student from an activity"""
     # Validate activity exists
     if activity_name not in activities:
-        raise HTTPException(status_code=404, detail="Activity not found")
+        raise HTTPException(status_code=404, detail=ERR_NOT_FOUND)
 
     # Get the specific activity
     activity = activities[activity_name]
 
     # Check if student is registered
     if email not in activity["participants"]:
-        raise HTTPException(status_code=400, detail="Student is not registered for this activity")
+        raise HTTPException(status_code=400, detail=ERR_NOT_REGISTERED)
     
     # Remove student
     activity["participants"].remove(email)
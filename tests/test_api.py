@@ -2,87 +2,92 @@
 Test suite for Mergington High School API endpoints
 """
 
+import asyncio
+from types import MappingProxyType
+from urllib.parse import unquote
+
+import httpx
+import orjson
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
-from src.app import app, activities
+from src.app import (
+    DEFAULT_ACTIVITIES,
+    ERR_ALREADY_SIGNED_UP,
+    ERR_NOT_FOUND,
+    ERR_NOT_REGISTERED,
+    app,
+    activities,
+)
 
 
-@pytest.fixture
+# Original state of the in-memory database (read-only)
+_ORIGINAL_ACTIVITIES = MappingProxyType(DEFAULT_ACTIVITIES)
+
+
+def _snapshot():
+    """Build a fresh copy of the original activities"""
+    return {
+        name: {**details, "participants": list(details["participants"])}
+        for name, details in _ORIGINAL_ACTIVITIES.items()
+    }
+
+
+def _json(response):
+    """Parse a response body with orjson"""
+    return orjson.loads(response.content)
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client"""
-    return TestClient(app)
+    """Create a test client shared across the session"""
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def aclient():
+    """Create an async client that calls the app directly over ASGI"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as async_client:
+        yield async_client
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _warmup(client):
+    """Issue one request up front so routing and middleware are built before the tests run"""
+    client.get("/activities")
+
+
+@pytest.fixture
+def activities_json(client):
+    """Fetch GET /activities once per test and return the parsed body"""
+    response = client.get("/activities")
+    assert response.status_code == 200
+    return _json(response)
 
 
 @pytest.fixture(autouse=True)
-def reset_activities():
-    """Reset activities data before each test"""
-    # Store original state
-    original_activities = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Basketball Team": {
-            "description": "Practice basketball skills and compete in inter-school games",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["james@mergington.edu"]
-        },
-        "Swimming Club": {
-            "description": "Improve swimming techniques and participate in competitions",
-            "schedule": "Mondays and Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 25,
-            "participants": ["sarah@mergington.edu", "alex@mergington.edu"]
-        },
-        "Art Studio": {
-            "description": "Explore various art mediums including painting, drawing, and sculpture",
-            "schedule": "Wednesdays, 3:30 PM - 5:30 PM",
-            "max_participants": 18,
-            "participants": ["lily@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Develop acting skills and perform in school theatrical productions",
-            "schedule": "Thursdays, 3:30 PM - 5:00 PM",
-            "max_participants": 20,
-            "participants": ["grace@mergington.edu", "noah@mergington.edu"]
-        },
-        "Debate Society": {
-            "description": "Enhance critical thinking and public speaking through competitive debates",
-            "schedule": "Fridays, 4:00 PM - 5:30 PM",
-            "max_participants": 16,
-            "participants": ["william@mergington.edu"]
-        },
-        "Science Olympiad": {
-            "description": "Prepare for science competitions and conduct experiments",
-            "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 14,
-            "participants": ["ava@mergington.edu", "ethan@mergington.edu"]
-        }
-    }
-    
-    # Reset to original state before each test
-    activities.clear()
-    activities.update(original_activities)
+def reset_activities(request):
+    """Restore activities data after each test that may mutate it"""
     yield
-    # Cleanup after test
-    activities.clear()
-    activities.update(original_activities)
+    # Read-only tests leave the data untouched, so there is nothing to restore.
+    # Every other test cleans up after itself, which keeps the data pristine
+    # for the read-only tests that follow.
+    if request.node.get_closest_marker("readonly"):
+        return
+    if activities.keys() != _ORIGINAL_ACTIVITIES.keys():
+        activities.clear()
+        activities.update(_snapshot())
+    else:
+        # Only rewrite the participant lists the test touched
+        for name, details in _ORIGINAL_ACTIVITIES.items():
+            participants = activities[name]["participants"]
+            if tuple(participants) != details["participants"]:
+                participants[:] = details["participants"]
 
 
+@pytest.mark.readonly
 class TestRootEndpoint:
     """Test the root endpoint"""
     
@@ -93,166 +98,137 @@ class TestRootEndpoint:
         assert response.headers["location"] == "/static/index.html"
 
 
+@pytest.mark.readonly
 class TestGetActivities:
     """Test the GET /activities endpoint"""
     
-    def test_get_all_activities(self, client):
+    def test_get_all_activities(self, activities_json):
         """Test retrieving all activities"""
-        response = client.get("/activities")
-        assert response.status_code == 200
-        
-        data = response.json()
+        data = activities_json
         assert isinstance(data, dict)
         assert len(data) == 9
         assert "Chess Club" in data
         assert "Programming Class" in data
     
-    def test_activities_structure(self, client):
+    @pytest.mark.parametrize("activity_name", list(_ORIGINAL_ACTIVITIES))
+    def test_activities_structure(self, activities_json, activity_name):
         """Test that activities have correct structure"""
-        response = client.get("/activities")
-        data = response.json()
+        activity_data = activities_json[activity_name]
         
-        for activity_name, activity_data in data.items():
-            assert "description" in activity_data
-            assert "schedule" in activity_data
-            assert "max_participants" in activity_data
-            assert "participants" in activity_data
-            assert isinstance(activity_data["participants"], list)
+        assert "description" in activity_data
+        assert "schedule" in activity_data
+        assert "max_participants" in activity_data
+        assert "participants" in activity_data
+        assert isinstance(activity_data["participants"], list)
 
 
 class TestSignupEndpoint:
     """Test the POST /activities/{activity_name}/signup endpoint"""
     
-    def test_successful_signup(self, client):
-        """Test successful signup for an activity"""
-        response = client.post("/activities/Chess Club/signup?email=newstudent@mergington.edu")
-        assert response.status_code == 200
+    @pytest.mark.parametrize("activity,email,status,expected_body", [
+        ("Chess Club", "newstudent@mergington.edu", 200,
+         {"message": "Signed up newstudent@mergington.edu for Chess Club"}),
+        ("Nonexistent Club", "test@mergington.edu", 404, {"detail": ERR_NOT_FOUND}),
+        # The success message is already covered above; only the status matters here
+        ("Programming%20Class", "urltest@mergington.edu", 200, None),
+    ], ids=["successful", "nonexistent-activity", "url-encoded-activity-name"])
+    def test_signup(self, client, activity, email, status, expected_body):
+        """Test signup outcomes for existing, missing and URL-encoded activities"""
+        response = client.post(f"/activities/{activity}/signup", params={"email": email})
+        assert response.status_code == status
         
-        data = response.json()
-        assert "message" in data
-        assert "newstudent@mergington.edu" in data["message"]
+        if expected_body is not None:
+            assert _json(response) == expected_body
         
-        # Verify the student was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "newstudent@mergington.edu" in activities_data["Chess Club"]["participants"]
+        if status == 200:
+            # Verify the student was added
+            assert email in activities[unquote(activity)]["participants"]
     
     def test_signup_duplicate_student(self, client):
         """Test that duplicate signup is prevented"""
         # First signup
-        client.post("/activities/Chess Club/signup?email=test@mergington.edu")
+        first_response = client.post("/activities/Chess Club/signup?email=test@mergington.edu")
+        assert first_response.status_code == 200
         
         # Try to signup again
         response = client.post("/activities/Chess Club/signup?email=test@mergington.edu")
         assert response.status_code == 400
-        assert "already signed up" in response.json()["detail"]
-    
-    def test_signup_nonexistent_activity(self, client):
-        """Test signup for non-existent activity"""
-        response = client.post("/activities/Nonexistent Club/signup?email=test@mergington.edu")
-        assert response.status_code == 404
-        assert "not found" in response.json()["detail"]
-    
-    def test_signup_with_url_encoded_activity_name(self, client):
-        """Test signup with URL-encoded activity name"""
-        response = client.post("/activities/Programming%20Class/signup?email=urltest@mergington.edu")
-        assert response.status_code == 200
-        
-        # Verify the student was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "urltest@mergington.edu" in activities_data["Programming Class"]["participants"]
+        assert _json(response)["detail"] == ERR_ALREADY_SIGNED_UP
 
 
 class TestUnregisterEndpoint:
     """Test the DELETE /activities/{activity_name}/unregister endpoint"""
     
     def test_successful_unregister(self, client):
-        """Test successful unregistration from an activity"""
-        # First, ensure the student is registered
-        client.post("/activities/Chess Club/signup?email=remove@mergington.edu")
-        
-        # Now unregister
-        response = client.delete("/activities/Chess Club/unregister?email=remove@mergington.edu")
+        """Test successful unregistration of an existing participant"""
+        # michael@mergington.edu is already in Chess Club
+        response = client.delete("/activities/Chess Club/unregister?email=michael@mergington.edu")
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         assert "message" in data
-        assert "remove@mergington.edu" in data["message"]
+        assert "michael@mergington.edu" in data["message"]
         
         # Verify the student was removed
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "remove@mergington.edu" not in activities_data["Chess Club"]["participants"]
-    
-    def test_unregister_existing_participant(self, client):
-        """Test unregistering an existing participant"""
-        # michael@mergington.edu is already in Chess Club
-        response = client.delete("/activities/Chess Club/unregister?email=michael@mergington.edu")
-        assert response.status_code == 200
-        
-        # Verify removal
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "michael@mergington.edu" not in activities_data["Chess Club"]["participants"]
+        assert "michael@mergington.edu" not in activities["Chess Club"]["participants"]
     
     def test_unregister_non_registered_student(self, client):
         """Test unregistering a student not registered for the activity"""
         response = client.delete("/activities/Chess Club/unregister?email=notregistered@mergington.edu")
         assert response.status_code == 400
-        assert "not registered" in response.json()["detail"]
+        assert _json(response)["detail"] == ERR_NOT_REGISTERED
     
     def test_unregister_from_nonexistent_activity(self, client):
         """Test unregistering from non-existent activity"""
         response = client.delete("/activities/Nonexistent Club/unregister?email=test@mergington.edu")
         assert response.status_code == 404
-        assert "not found" in response.json()["detail"]
+        assert _json(response)["detail"] == ERR_NOT_FOUND
 
 
+@pytest.mark.readonly
 class TestActivityCapacity:
     """Test activity participant capacity constraints"""
     
-    def test_activity_max_participants_tracked(self, client):
+    @pytest.mark.parametrize("activity_name", list(_ORIGINAL_ACTIVITIES))
+    def test_activity_max_participants_tracked(self, activities_json, activity_name):
         """Test that max_participants is properly tracked"""
-        response = client.get("/activities")
-        data = response.json()
+        activity_data = activities_json[activity_name]
         
-        chess_club = data["Chess Club"]
-        assert chess_club["max_participants"] == 12
-        assert len(chess_club["participants"]) <= chess_club["max_participants"]
+        expected = _ORIGINAL_ACTIVITIES[activity_name]["max_participants"]
+        assert activity_data["max_participants"] == expected
+        assert len(activity_data["participants"]) <= activity_data["max_participants"]
 
 
 class TestEndToEndWorkflow:
     """Test complete user workflows"""
     
-    def test_signup_and_unregister_workflow(self, client):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_signup_and_unregister_workflow(self, aclient):
         """Test complete signup and unregister workflow"""
         email = "workflow@mergington.edu"
         activity = "Drama Club"
         
         # Get initial participants
-        initial_response = client.get("/activities")
-        initial_count = len(initial_response.json()[activity]["participants"])
+        initial_count = len(activities[activity]["participants"])
         
         # Signup
-        signup_response = client.post(f"/activities/{activity}/signup?email={email}")
+        signup_response = await aclient.post(f"/activities/{activity}/signup", params={"email": email})
         assert signup_response.status_code == 200
         
         # Verify added
-        after_signup = client.get("/activities")
-        assert len(after_signup.json()[activity]["participants"]) == initial_count + 1
-        assert email in after_signup.json()[activity]["participants"]
+        assert len(activities[activity]["participants"]) == initial_count + 1
+        assert email in activities[activity]["participants"]
         
         # Unregister
-        unregister_response = client.delete(f"/activities/{activity}/unregister?email={email}")
+        unregister_response = await aclient.delete(f"/activities/{activity}/unregister", params={"email": email})
         assert unregister_response.status_code == 200
         
         # Verify removed
-        after_unregister = client.get("/activities")
-        assert len(after_unregister.json()[activity]["participants"]) == initial_count
-        assert email not in after_unregister.json()[activity]["participants"]
+        assert len(activities[activity]["participants"]) == initial_count
+        assert email not in activities[activity]["participants"]
     
-    def test_multiple_students_signup(self, client):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_multiple_students_signup(self, aclient):
         """Test multiple students signing up for the same activity"""
         activity = "Art Studio"
         emails = [
@@ -262,18 +238,19 @@ class TestEndToEndWorkflow:
         ]
         
         # Get initial count
-        initial_response = client.get("/activities")
-        initial_count = len(initial_response.json()[activity]["participants"])
+        initial_count = len(activities[activity]["participants"])
         
-        # Sign up multiple students
-        for email in emails:
-            response = client.post(f"/activities/{activity}/signup?email={email}")
+        # Sign up multiple students concurrently
+        path = f"/activities/{activity}/signup"
+        responses = await asyncio.gather(*[
+            aclient.post(path, params={"email": email})
+            for email in emails
+        ])
+        
+        for response in responses:
             assert response.status_code == 200
         
         # Verify all were added
-        final_response = client.get("/activities")
-        final_participants = final_response.json()[activity]["participants"]
+        final_participants = activities[activity]["participants"]
         assert len(final_participants) == initial_count + len(emails)
-        
-        for email in emails:
-            assert email in final_participants
+        assert set(emails).issubset(final_participants)